@@ -0,0 +1,116 @@
+"""
+sqlite_rx connector for the webserver database service.
+
+The SQLite database runs behind a sqlite_rx server and is reached over a
+ZeroMQ socket. This module keeps one SQLiteClient per database URL so that
+every query reuses an already connected client instead of paying the
+connect/close handshake per statement.
+"""
+
+import logging
+
+from sqlite_rx.client import SQLiteClient
+
+# One client per database URL, created lazily and reused for every query
+_CLIENTS = {}
+
+
+def get_client(db_url: str):
+    """
+    Return the cached SQLiteClient for the given database URL.
+
+    The first call for a URL connects the client; every later call returns
+    the same instance, so repeated queries share one socket.
+
+    Args:
+        db_url (str): The connect address of the sqlite_rx server.
+
+    Returns:
+        client (SQLiteClient): The connected client for the URL.
+    """
+    client = _CLIENTS.get(db_url)
+    if client is None:
+        client = SQLiteClient(connect_address=db_url)
+        _CLIENTS[db_url] = client
+    return client
+
+
+def close_clients():
+    """
+    Close and drop every cached client.
+
+    Intended for shutdown or test-session teardown; the next get_client
+    call reconnects lazily.
+    """
+    while _CLIENTS:
+        _, client = _CLIENTS.popitem()
+        client.cleanup()
+
+
+def database_query(db_url: str, query: str, params: dict):
+    """
+    Execute a single SQL statement against the sqlite_rx server.
+
+    A non-empty params dict is delivered through the server's executemany
+    path (see below), which sqlite3 restricts to DML — a parametrized
+    SELECT raises server-side. Only parameterless statements can return
+    rows; SELECTs must therefore go through the no-params path.
+
+    Args:
+        db_url (str): The connect address of the sqlite_rx server.
+        query (str): The SQL statement with named placeholders.
+        params (dict): Named parameters for the statement. Non-empty
+            params restrict the statement to DML (INSERT/UPDATE/DELETE).
+
+    Returns:
+        items (list): The rows returned by the server; always empty for
+            the parametrized (DML-only) path.
+
+    Raises:
+        RuntimeError: If the server reports an error for the statement.
+    """
+    client = get_client(db_url)
+    if params:
+        # The client packs positional args into a list, so the server would
+        # bind the dict itself as a single parameter. Sending the dict as a
+        # one-element executemany batch binds the named parameters correctly.
+        result = client.execute(query, params, execute_many=True)
+    else:
+        result = client.execute(query)
+    return _unwrap_result(result)
+
+
+def database_query_many(db_url: str, query: str, seq_of_params):
+    """
+    Execute one SQL statement for many parameter sets in a single request.
+
+    The whole batch travels to the sqlite_rx server in one round-trip and
+    runs through cursor.executemany there — no per-row requests and no
+    per-row Python call overhead. Note that the server connection is in
+    autocommit mode, so the rows still commit individually; the saving is
+    the single round-trip, not a transactional guarantee.
+
+    Args:
+        db_url (str): The connect address of the sqlite_rx server.
+        query (str): The SQL statement with named placeholders.
+        seq_of_params (list): One params dict per row.
+
+    Returns:
+        items (list): The rows returned by the server.
+
+    Raises:
+        RuntimeError: If the server reports an error for the batch.
+    """
+    client = get_client(db_url)
+    result = client.execute(query, *seq_of_params, execute_many=True)
+    return _unwrap_result(result)
+
+
+def _unwrap_result(result: dict):
+    """
+    Return the rows of a sqlite_rx reply, raising on a reported error.
+    """
+    if result.get("error") is not None:
+        logging.error("Database query failed: %s", result["error"])
+        raise RuntimeError(result["error"])
+    return result.get("items", [])
@@ -1,253 +1,353 @@
-import sys
-import os
-import pytest
-import json
-
-
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-
-from database.sqlite_rx_connector import database_query  # noqa: E402
-from config import load_config_webserver  # noqa: E402
-
-
-KONFUZIO_ID = os.environ.get('PROJECT_ID')
-USER1 = "oleksandra@domen.com"
-USER2 = "second_user@post.de"
-REVIEWER1_TIME = "2023-09-01 14:30:00"
-REVIEWER2_TIME = "2023-09-02 17:00:00"
-
-INSERT_QUERY = (
-            "INSERT INTO table ("
-            "id, reviewer1, reviewer1_time, reviewer2, reviewer2_time, to_update"
-            ") VALUES ("
-            ":id, :reviewer1, :reviewer1_time, :reviewer2, :reviewer2_time, :to_update);"
-        )
-
-DELETE_QUERY = (
-            "DELETE FROM table WHERE id = :id;"
-        )
-
-
-@pytest.fixture(scope="session")
-def test_app():
-    """
-    Fixture that provides the Flask application object for testing.
-
-    This fixture imports the webserver module, loads the configuration file,
-    and sets the web server configuration in the application object. It then
-    returns the application object for testing.
-
-    Returns:
-        app (Flask): The Flask application object for testing.
-    """
-    from webserver import app
-
-    path_to_ini_file = os.path.join(
-        os.path.dirname(__file__), "..", "webserver_unittest.ini"
-    )
-    path_to_ini_file = os.path.normpath(path_to_ini_file)
-    webserver_config = load_config_webserver(path_to_ini_file)
-    app.config["WEB_SERVER_CONFIG"] = webserver_config
-    # print(f"Path to ini file: {path_to_ini_file}")
-    print(f"app: {app}")
-    return app
-
-
-@pytest.fixture
-def client(test_app):
-    """
-    Fixture that provides a test client for making requests to the Flask application.
-
-    This fixture depends on the 'test_app' fixture to get the Flask application object.
-    It returns a test client that can be used to make requests to the application during testing.
-
-    The test client makes requests to the application without running a live server.
-    The client has methods that match the common HTTP request methods,
-    such as client.get() and client.post().
-
-    Args:
-        test_app (Flask): The Flask application object for testing.
-
-    Returns:
-        client (FlaskClient): A test client for making requests to the Flask application.
-    """
-    return test_app.test_client()
-
-
-@pytest.fixture(scope="session")
-def db_url(test_app):
-    """
-    Fixture that provides the database URL for testing.
-
-    This fixture depends on the 'test_app' fixture to get the Flask application object.
-    It retrieves the database URL from the application configuration and returns it for testing.
-
-    Args:
-        test_app (Flask): The Flask application object for testing.
-
-    Returns:
-        db_url (str): The URL of the database for testing.
-    """
-    db_url = test_app.config["WEB_SERVER_CONFIG"].database_service.base_url
-    print(f"Working with TEST DB: {db_url}")
-    return db_url
-
-
-@pytest.fixture
-def mock_data_no_reviewers(request, test_app, db_url):
-    """
-    Fixture to add mock data from multiple JSON files to the test database
-    and delete them after tests finish.
-
-    The process of creating and deleting known records will be repeated
-    for every test function that requires fixture.
-    This ensures that each test function starts with a clean and consistent state,
-    preventing any interference or dependencies between tests.
-    """
-    # List of JSON files
-    json_files = ["NOREW0000001.json",
-                  "NOREW0000002.json",
-                  "NOREW0000003.json"]
-    added_records = []
-
-    for json_file in json_files:
-        json_path = os.path.join(os.path.dirname(__file__), "mocks", json_file)
-
-        with open(json_path, "r") as json_file:
-            data = json.load(json_file)
-
-            params = {
-                "id": data["id"],
-                "reviewer1": None,
-                "reviewer1_time": None,
-                "reviewer2": None,
-                "reviewer2_time": None,
-                "to_update": None
-            }
-
-            # Add data to the database
-            database_query(db_url, INSERT_QUERY, params)
-            # Store the identifier for deletion later
-            added_records.append(data['id'])
-
-    def finalize():
-        # Delete the added records from the database when tests finish
-        for idin added_records:
-            params = {
-                "id": id}
-            database_query(db_url, DELETE_QUERY, params)
-
-    request.addfinalizer(finalize)
-    return added_records
-
-
-@pytest.fixture
-def mock_data_one_reviewer(request, test_app, db_url):
-    """
-    Fixture to add mock data from multiple JSON files to the test database
-    and delete them after tests finish.
-    """
-    # List of JSON files
-    json_files = ["ONEREW000001.json",
-                  "ONEREW000002.json",
-                  "ONEREW000003.json"]
-    added_records = []
-
-    for json_file in json_files:
-        json_path = os.path.join(os.path.dirname(__file__), "mocks", json_file)
-
-        with open(json_path, "r") as json_file:
-            data = json.load(json_file)
-
-            params = {
-                "id": data["id"],
-                "reviewer1": USER1,
-                "reviewer1_time": REVIEWER1_TIME,
-                "reviewer2": None,
-                "reviewer2_time": None,
-                "to_update": None
-            }
-
-            # Add data to the database
-            database_query(db_url, INSERT_QUERY, params)
-            # Store the identifier for deletion later
-            added_records.append(data['id'])
-
-    def finalize():
-        # Delete the added records from the database when tests finish
-        for id in added_records:
-            params = {
-                "id": id}
-            database_query(db_url, DELETE_QUERY, params)
-
-    request.addfinalizer(finalize)
-    return added_records
-
-
-@pytest.fixture
-def mock_data_both_reviewers(request, test_app, db_url):
-    """
-    Fixture to add mock data from multiple JSON files to the test database
-    and delete them after tests finish.
-
-    The process of creating and deleting known records will be repeated
-    for every test function that requures fixture.
-    This ensures that each test function starts with a clean and consistent state,
-    preventing any interference or dependencies between tests.
-    """
-
-    # List of JSON files
-    json_files = ["BOTHREW00001.json",
-                  "BOTHREW00002.json",
-                  "BOTHREW00003.json"]
-    added_records = []
-
-    for json_file in json_files:
-        json_path = os.path.join(os.path.dirname(__file__), "mocks", json_file)
-
-        with open(json_path, "r") as json_file:
-            data = json.load(json_file)
-
-            params = {
-                "id": data["id"],
-                "reviewer1": USER1,
-                "reviewer1_time": REVIEWER1_TIME,
-                "reviewer2": USER2,
-                "reviewer2_time": REVIEWER2_TIME,
-                "to_update": None
-            }
-
-            # Add data to the database
-            database_query(db_url, INSERT_QUERY, params)
-            # Store the identifier for deletion later
-            added_records.append(data['id'])
-
-    def finalize():
-        # Delete the added records from the database when tests finish
-        for id in added_records:
-            params = {
-                "id": id}
-            database_query(db_url, DELETE_QUERY, params)
-
-    request.addfinalizer(finalize)
-    return added_records
-
-
-@pytest.fixture
-def user1():
-    return USER1
-
-
-@pytest.fixture
-def user2():
-    return USER2
-
-
-@pytest.fixture
-def reviewer1_data():
-    return USER1, REVIEWER1_TIME
-
-
-@pytest.fixture
-def reviewer2_data():
-    return USER2, REVIEWER2_TIME
+import sys
+import os
+import logging
+import pytest
+import json
+from functools import lru_cache
+
+
+# The parent project directory must be importable before the imports below;
+# the guard keeps repeated conftest imports from stacking duplicate entries.
+_PARENT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _PARENT_DIR not in sys.path:
+    sys.path.insert(0, _PARENT_DIR)
+
+from database.sqlite_rx_connector import (  # noqa: E402
+    database_query,
+    database_query_many,
+    get_client,
+    close_clients,
+)
+from config import load_config_webserver  # noqa: E402
+
+
+KONFUZIO_ID = os.environ.get('PROJECT_ID')
+USER1 = "oleksandra@domen.com"
+USER2 = "second_user@post.de"
+REVIEWER1_TIME = "2023-09-01 14:30:00"
+REVIEWER2_TIME = "2023-09-02 17:00:00"
+
+INSERT_QUERY = (
+            "INSERT INTO table ("
+            "id, reviewer1, reviewer1_time, reviewer2, reviewer2_time, to_update"
+            ") VALUES ("
+            ":id, :reviewer1, :reviewer1_time, :reviewer2, :reviewer2_time, :to_update);"
+        )
+
+DELETE_QUERY = (
+            "DELETE FROM table WHERE id = :id;"
+        )
+
+# Directory with the JSON mock files, resolved once at import
+MOCKS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mocks")
+
+NOREW_FILES = ("NOREW0000001.json",
+               "NOREW0000002.json",
+               "NOREW0000003.json")
+
+ONEREW_FILES = ("ONEREW000001.json",
+                "ONEREW000002.json",
+                "ONEREW000003.json")
+
+BOTHREW_FILES = ("BOTHREW00001.json",
+                 "BOTHREW00002.json",
+                 "BOTHREW00003.json")
+
+MOCK_FILES = NOREW_FILES + ONEREW_FILES + BOTHREW_FILES
+
+# Reviewer columns per mock-data variant; the remaining columns
+# (id, to_update) are filled in by the mock_data fixture itself.
+MOCK_VARIANTS = {
+    "no_reviewers": (NOREW_FILES, {
+        "reviewer1": None,
+        "reviewer1_time": None,
+        "reviewer2": None,
+        "reviewer2_time": None,
+    }),
+    "one_reviewer": (ONEREW_FILES, {
+        "reviewer1": USER1,
+        "reviewer1_time": REVIEWER1_TIME,
+        "reviewer2": None,
+        "reviewer2_time": None,
+    }),
+    "both_reviewers": (BOTHREW_FILES, {
+        "reviewer1": USER1,
+        "reviewer1_time": REVIEWER1_TIME,
+        "reviewer2": USER2,
+        "reviewer2_time": REVIEWER2_TIME,
+    }),
+}
+
+
+def _bulk_insert(db_url, rows):
+    """
+    Insert several rows into the test table in one batched request.
+
+    All rows go through database_query_many in a single call; the
+    connector runs the batch with cursor.executemany on the server, so
+    there are no per-row round-trips and no statement building. The rows
+    still commit individually on the server's autocommit connection.
+
+    Args:
+        db_url (str): The URL of the database for testing.
+        rows (list): List of dicts, one per row, keyed by the table columns.
+    """
+    database_query_many(db_url, INSERT_QUERY, rows)
+
+
+def _bulk_delete(db_url, record_ids):
+    """
+    Delete several rows from the test table with one DELETE ... WHERE id IN (...).
+
+    Args:
+        db_url (str): The URL of the database for testing.
+        record_ids (list): The ids of the rows to delete.
+    """
+    placeholders = ", ".join(f":id_{index}" for index in range(len(record_ids)))
+    params = {f"id_{index}": record_id
+              for index, record_id in enumerate(record_ids)}
+    query = f"DELETE FROM table WHERE id IN ({placeholders});"
+    database_query(db_url, query, params)
+
+
+@lru_cache(maxsize=None)
+def _load_mock(json_file):
+    """
+    Load and cache a single JSON mock file.
+
+    Each file is read and parsed at most once per process, no matter how
+    many fixtures or sessions ask for it.
+
+    Args:
+        json_file (str): The filename of the mock inside MOCKS_DIR.
+
+    Returns:
+        data (dict): The parsed JSON content of the mock file.
+    """
+    with open(os.path.join(MOCKS_DIR, json_file), "r") as fh:
+        return json.load(fh)
+
+
+@lru_cache(maxsize=1)
+def _load_cfg():
+    """
+    Load and cache the webserver unittest configuration.
+
+    The ini file is parsed once per process; every later call returns the
+    cached object, so repeated fixture setups (and collection passes) do
+    not re-read and re-parse the file.
+    """
+    path_to_ini_file = os.path.join(
+        os.path.dirname(__file__), "..", "webserver_unittest.ini"
+    )
+    return load_config_webserver(os.path.normpath(path_to_ini_file))
+
+
+@pytest.fixture(scope="session")
+def webserver_config():
+    """
+    Fixture that provides the parsed webserver unittest configuration.
+
+    Both 'test_app' and 'db_url' depend on this fixture, so the parsed
+    ini is shared and fixtures that only need the database never have to
+    construct the Flask application.
+
+    Returns:
+        webserver_config: The parsed webserver configuration object.
+    """
+    return _load_cfg()
+
+
+@pytest.fixture(scope="session", autouse=False)
+def test_app(webserver_config):
+    """
+    Fixture that provides the Flask application object for testing.
+
+    This fixture imports the webserver module and sets the shared web server
+    configuration in the application object. It then returns the application
+    object for testing.
+
+    Returns:
+        app (Flask): The Flask application object for testing.
+    """
+    from webserver import app
+
+    app.config["WEB_SERVER_CONFIG"] = webserver_config
+    logging.debug("app: %s", app)
+    return app
+
+
+@pytest.fixture
+def client(test_app):
+    """
+    Fixture that provides a test client for making requests to the Flask application.
+
+    This fixture depends on the 'test_app' fixture to get the Flask application object.
+    It returns a test client that can be used to make requests to the application during testing.
+
+    The test client makes requests to the application without running a live server.
+    The client has methods that match the common HTTP request methods,
+    such as client.get() and client.post().
+
+    Args:
+        test_app (Flask): The Flask application object for testing.
+
+    Returns:
+        client (FlaskClient): A test client for making requests to the Flask application.
+    """
+    return test_app.test_client()
+
+
+@pytest.fixture(scope="session")
+def db_url(request, webserver_config):
+    """
+    Fixture that provides the database URL for testing.
+
+    The URL is read straight from the parsed configuration, so fixtures
+    that only talk to the database (the mock_data variants) do not pay
+    for Flask application import and setup.
+
+    Args:
+        webserver_config: The parsed webserver configuration object.
+
+    Returns:
+        db_url (str): The URL of the database for testing.
+    """
+    db_url = webserver_config.database_service.base_url
+    # Remember the URL for the pytest_sessionfinish leak check
+    request.config._test_db_url = db_url
+    logging.debug("Working with TEST DB: %s", db_url)
+    return db_url
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session, exitstatus):
+    """
+    Verify that the test table is empty once the whole session is done.
+
+    The mock_data finalizers and the _session_cleanup sweep should leave
+    no rows behind; a non-empty table here means teardown regressed and
+    rows would accumulate across runs, slowing down every later insert.
+
+    trylast makes this run after the runner's own sessionfinish impl,
+    which finalizes still-pending session fixtures on early-exit runs
+    (-x, Ctrl-C, collection errors) — otherwise the check would count
+    rows before the _session_cleanup sweep and a failing assert would
+    abort the remaining impls, skipping the sweep entirely.
+    """
+    db_url = getattr(session.config, "_test_db_url", None)
+    if db_url is None:
+        # No test touched the database in this session
+        return
+    rows = database_query(db_url, "SELECT COUNT(*) FROM table;", {})
+    leftover = rows[0][0] if rows else 0
+    assert not leftover, f"{leftover} row(s) left in the test table after teardown"
+
+
+@pytest.fixture(scope="session")
+def mocks():
+    """
+    Fixture that loads all JSON mock files once per test session.
+
+    Opening and parsing the mock files is paid a single time; the
+    mock_data_* fixtures then pick their rows out of the returned dict,
+    keyed by filename. The per-test database insert/delete is kept,
+    so test isolation semantics are unchanged.
+
+    Returns:
+        mocks (dict): Mapping of mock filename to its parsed JSON content.
+    """
+    return {json_file: _load_mock(json_file) for json_file in MOCK_FILES}
+
+
+@pytest.fixture(scope="session")
+def db_client(db_url):
+    """
+    Fixture that provides the shared sqlite_rx client for the session.
+
+    get_client caches one client per database URL, so every database_query
+    call made by the fixtures reuses this connection instead of opening a
+    new one per statement. The connection is closed once at session end.
+    """
+    client = get_client(db_url)
+    yield client
+    close_clients()
+
+
+@pytest.fixture(scope="session")
+def _session_cleanup(db_url, db_client):
+    """
+    Session-wide safety net for rows inserted by the mock_data_* fixtures.
+
+    The fixtures record every inserted id in the yielded set. Their own
+    per-test finalizers normally remove the rows again; whatever is left
+    at the end of the session (e.g. after a crashed teardown) is swept
+    with a single DELETE ... WHERE id IN (...) so the test table never
+    accumulates rows across runs.
+    """
+    added_ids = set()
+    yield added_ids
+    if added_ids:
+        _bulk_delete(db_url, sorted(added_ids))
+
+
+@pytest.fixture
+def mock_data(request, db_url, mocks, _session_cleanup):
+    """
+    Parametrized fixture to add mock data to the test database
+    and delete it after tests finish.
+
+    Tests select the reviewer variant via indirect parametrization:
+
+        @pytest.mark.parametrize("mock_data", ["no_reviewers"], indirect=True)
+
+    Valid variants are the keys of MOCK_VARIANTS: "no_reviewers",
+    "one_reviewer" and "both_reviewers".
+
+    The process of creating and deleting known records will be repeated
+    for every test function that requires the fixture.
+    This ensures that each test function starts with a clean and consistent state,
+    preventing any interference or dependencies between tests.
+    """
+    json_files, reviewer_fields = MOCK_VARIANTS[request.param]
+    added_records = []
+    rows = []
+
+    for json_file in json_files:
+        data = mocks[json_file]
+
+        row = {"id": data["id"], "to_update": None}
+        row.update(reviewer_fields)
+        rows.append(row)
+        # Store the identifier for deletion later
+        added_records.append(data['id'])
+
+    # Add all rows to the database with a single statement
+    _bulk_insert(db_url, rows)
+    _session_cleanup.update(added_records)
+
+    yield added_records
+
+    # Delete the added records from the database when the test finishes
+    _bulk_delete(db_url, added_records)
+    _session_cleanup.difference_update(added_records)
+
+
+@pytest.fixture(scope="session")
+def user1():
+    return USER1
+
+
+@pytest.fixture(scope="session")
+def user2():
+    return USER2
+
+
+@pytest.fixture(scope="session")
+def reviewer1_data():
+    return USER1, REVIEWER1_TIME
+
+
+@pytest.fixture(scope="session")
+def reviewer2_data():
+    return USER2, REVIEWER2_TIME